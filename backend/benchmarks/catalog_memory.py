@@ -0,0 +1,133 @@
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from services.scheme_catalog import SchemeCatalog
+from services.scheme_matching import SCHEMES_DB
+
+# Run from the backend directory:
+#   python -m benchmarks.catalog_memory --sizes 10000 100000
+
+STATES = ["Bihar", "Uttar Pradesh", "Rajasthan", "Odisha", "Assam", "Kerala", "Maharashtra", "Gujarat"]
+
+PROFILES = [
+    {"has_aadhaar": True, "state": "Bihar", "income_level": "bpl", "has_lpg_connection": False},
+    {"has_aadhaar": True, "state": "Kerala", "is_pregnant": True, "children_count": 0},
+    {"has_aadhaar": True, "state": "Assam", "is_farmer": True, "land_holding": "large", "max_age": 60},
+    {"has_aadhaar": True},
+]
+
+
+def generate_schemes(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate synthetic state/central schemes shaped like SCHEMES_DB.
+
+    Documents, steps and criteria are drawn from the seed schemes (plus a few
+    state-specific variants) so vocabularies stay realistic in size. Each scheme
+    also gets its own list of eligible states and an age limit, so most
+    criteria blocks are distinct, as in a real multi-state catalog.
+    """
+    rng = random.Random(seed)
+    documents = sorted({d for s in SCHEMES_DB for d in s["documents"]})
+    documents += [f"{state} Domicile Certificate" for state in STATES]
+    steps = sorted({st for s in SCHEMES_DB for st in s["steps"]})
+    steps += [f"Apply on the {state} state portal" for state in STATES]
+
+    for i in range(count):
+        base = SCHEMES_DB[i % len(SCHEMES_DB)]
+        state = STATES[i % len(STATES)]
+        yield {
+            "id": f"{base['id']}_{i}",
+            "title": f"{base['title']} ({state} #{i})",
+            "description": f"{base['description']} in {state}, variant {i}",
+            "eligibility": base["eligibility"],
+            "eligibility_criteria": {
+                **{k: (list(v) if isinstance(v, list) else v) for k, v in base["eligibility_criteria"].items()},
+                "state": sorted(rng.sample(STATES, rng.randint(1, 3))),
+                "max_age": rng.randint(18, 80),
+            },
+            "documents": rng.sample(documents, 3),
+            "steps": rng.sample(steps, 4),
+            "benefits": base["benefits"],
+        }
+
+
+def legacy_match(schemes: List[Dict[str, Any]], user_profile: Dict[str, Any], limit: int = 3) -> List[Dict[str, Any]]:
+    # Original dict-walking matcher, kept here for comparison
+    matched = []
+    for scheme in schemes:
+        is_match = True
+        for key, value in scheme.get("eligibility_criteria", {}).items():
+            if key in user_profile:
+                if isinstance(value, list):
+                    if user_profile[key] not in value:
+                        is_match = False
+                        break
+                elif user_profile[key] != value:
+                    is_match = False
+                    break
+        if is_match:
+            matched.append(scheme)
+            if len(matched) >= limit:
+                break
+    return matched
+
+
+def measure(build: Callable[[], Any]) -> Tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def time_matches(match: Callable[[Dict[str, Any]], Any], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for profile in PROFILES:
+            match(profile)
+    return (time.perf_counter() - started) / (rounds * len(PROFILES)) * 1e6
+
+
+def run(size: int, rounds: int) -> None:
+    # Load through JSON like a real catalog would be, so no strings are shared by accident
+    payload = json.dumps(list(generate_schemes(size)), ensure_ascii=False)
+    schemes, dict_bytes = measure(lambda: json.loads(payload))
+    catalog, catalog_bytes = measure(lambda: SchemeCatalog.from_dicts(json.loads(payload)))
+
+    for profile in PROFILES:
+        assert [s["id"] for s in legacy_match(schemes, profile, limit=size)] == \
+            [r.id for r in catalog.match(profile, limit=size)]
+
+    # Exhaustive matching (no limit hit) is the worst case for both layouts;
+    # top 3 is what match_schemes asks for
+    full = {"income_level": "none"}
+    legacy_full = time_matches(lambda p: legacy_match(schemes, {**p, **full}, limit=size), rounds)
+    compact_full = time_matches(lambda p: catalog.match({**p, **full}, limit=size), rounds)
+    legacy_top = time_matches(lambda p: legacy_match(schemes, p, limit=3), rounds)
+    compact_top = time_matches(lambda p: catalog.match(p, limit=3), rounds)
+
+    print(f"{size:>8} schemes, {len(catalog._blocks):>6} criteria blocks | dicts {dict_bytes / 2**20:7.1f} MiB, "
+          f"catalog {catalog_bytes / 2**20:7.1f} MiB ({catalog_bytes / dict_bytes:.0%}) | "
+          f"full scan {legacy_full / 1000:6.2f} -> {compact_full / 1000:6.2f} ms | "
+          f"top 3 {legacy_top / 1000:6.2f} -> {compact_top / 1000:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheme catalog memory benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import io
+import json
+import time
+import wave
+import asyncio
+import random
+import struct
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from services.tracing import read_traces
+
+# Run from the backend directory against a local app instance started with
+# MAITRI_REPLAY=1, so the scheduler rate-limits each recorded client separately
+# instead of treating the whole replay as one host:
+#   MAITRI_REPLAY=1 uvicorn main:app
+#   python -m benchmarks.replay_traces traces/voice.jsonl --base-url http://localhost:8000 --speed 1
+# Without MAITRI_REPLAY, raise MAITRI_CLIENT_RATE / MAITRI_CLIENT_BURST on the app instead.
+#
+# Traces never contain the original audio or text, so every replayed input is
+# synthesized (silence, envelope-shaped noise or placeholder text) and its
+# latency is not comparable to the recorded one. To check a performance change,
+# save a replay with --output before the change and pass it as --baseline after.
+
+REPLAYABLE_ROUTES = ("/audio/speech-to-text", "/audio/process", "/audio/text-to-speech")
+
+# Stand-in for hashed text inputs, repeated to the original length
+PLACEHOLDER_CHAR = "क"
+
+# Sample rate of synthesized stand-in audio (matches Whisper's input rate)
+SAMPLE_RATE = 16000
+
+
+def _wav(samples: List[int]) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return buffer.getvalue()
+
+
+def silent_wav(size: int) -> bytes:
+    """Silent 16-bit mono WAV of roughly `size` bytes, standing in for hashed audio."""
+    return _wav([0] * max(0, (size - 44) // 2))
+
+
+def envelope_wav(envelope: List[int], envelope_rate: int, seed: int = 0) -> bytes:
+    """White noise shaped by a recorded loudness envelope (see tracing.describe_audio)."""
+    rng = random.Random(seed)
+    frame = SAMPLE_RATE // envelope_rate
+    samples = []
+    for level in envelope:
+        # Uniform noise in [-a, a] has RMS a / sqrt(3)
+        amplitude = min(32767, int(level / 255 * 32767 * 3 ** 0.5))
+        samples.extend(rng.randint(-amplitude, amplitude) for _ in range(frame))
+    return _wav(samples)
+
+
+def load_audio(trace: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Stand-in audio for a trace, and which kind of stand-in it is."""
+    audio = trace["input"].get("audio", {})
+    if "envelope" in audio:
+        return envelope_wav(audio["envelope"], audio["envelope_rate"]), "envelope_noise"
+    return silent_wav(audio.get("bytes", 0)), "silence"
+
+
+def load_text(trace: Dict[str, Any]) -> str:
+    text = trace["input"].get("text", {})
+    return PLACEHOLDER_CHAR * text.get("chars", 1)
+
+
+async def replay_one(session: aiohttp.ClientSession, base_url: str, trace: Dict[str, Any]) -> Dict[str, Any]:
+    url = base_url.rstrip("/") + trace["route"]
+    headers = dict(trace["input"].get("headers", {}))
+    if "client" in trace["input"]:
+        headers["X-Replay-Client"] = trace["input"]["client"]
+
+    if trace["route"] == "/audio/text-to-speech":
+        request = session.post(url, params={"text": load_text(trace)}, headers=headers)
+        input_kind = "placeholder_text"
+    else:
+        content, input_kind = load_audio(trace)
+        form = aiohttp.FormData()
+        form.add_field("audio_file", content, filename="audio.wav", content_type="audio/wav")
+        request = session.post(url, data=form, headers=headers)
+
+    started = time.perf_counter()
+    try:
+        async with request as response:
+            await response.read()
+            status = response.status
+    except aiohttp.ClientError as e:
+        status = type(e).__name__
+
+    return {
+        "trace_id": trace["trace_id"],
+        "route": trace["route"],
+        "input": input_kind,
+        "original_ms": trace["total_ms"],
+        "replay_ms": round((time.perf_counter() - started) * 1000, 2),
+        "original_status": trace["status"],
+        "replay_status": status,
+    }
+
+
+async def replay(path: str, base_url: str, speed: float, routes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Re-drive recorded traces against an app instance, keeping their arrival pattern.
+
+    Args:
+        path: Trace log path
+        base_url: App base URL
+        speed: Time scale for inter-arrival gaps (2.0 replays twice as fast, 0 sends all at once)
+        routes: Only replay these routes
+
+    Returns:
+        Per-trace results with original and replayed latency
+    """
+    routes = routes or list(REPLAYABLE_ROUTES)
+    traces = sorted((t for t in read_traces(path) if t.get("route") in routes), key=lambda t: t["ts"])
+    if not traces:
+        return []
+
+    first_ts = traces[0]["ts"]
+    started = time.monotonic()
+
+    async def scheduled(session: aiohttp.ClientSession, trace: Dict[str, Any]) -> Dict[str, Any]:
+        if speed > 0:
+            delay = (trace["ts"] - first_ts) / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return await replay_one(session, base_url, trace)
+
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(*(scheduled(session, t) for t in traces))
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def report(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    """
+    Print latency per route and input kind.
+
+    Recorded latencies are shown for context only: replayed inputs are
+    synthesized, so deltas are computed against a baseline replay of the
+    same log (matched by trace_id), never against the recorded latency.
+    """
+    print(f"{'route':<24} {'input':<17} {'n':>5} {'rec p50':>9} {'rec p95':>9} {'replay p50':>11} "
+          f"{'replay p95':>11} {'Δp95 vs base':>13} {'status≠':>8}")
+    for route, kind in sorted({(r["route"], r["input"]) for r in results}):
+        rows = [r for r in results if r["route"] == route and r["input"] == kind]
+        original = [r["original_ms"] for r in rows]
+        replayed = [r["replay_ms"] for r in rows]
+        mismatched = sum(1 for r in rows if r["original_status"] != r["replay_status"])
+
+        delta = "—"
+        if baseline:
+            base = [baseline[r["trace_id"]]["replay_ms"] for r in rows
+                    if r["trace_id"] in baseline and baseline[r["trace_id"]].get("input") == kind]
+            if base:
+                delta = f"{percentile(replayed, 0.95) - percentile(base, 0.95):+.1f}"
+
+        print(f"{route:<24} {kind + '*':<17} {len(rows):>5} {percentile(original, 0.5):>9.1f} "
+              f"{percentile(original, 0.95):>9.1f} {percentile(replayed, 0.5):>11.1f} "
+              f"{percentile(replayed, 0.95):>11.1f} {delta:>13} {mismatched:>8}")
+
+    print("\n* Synthesized input: replay latency is not comparable to the recorded (rec) latency. "
+          "Compare replays of the same log with --baseline.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded voice pipeline traces")
+    parser.add_argument("trace_log", help="Trace log written with MAITRI_TRACE=1")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="App instance to replay against")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Arrival time scale (1 = original pacing, 2 = twice as fast, 0 = no pacing)")
+    parser.add_argument("--route", action="append", help="Only replay this route (repeatable)")
+    parser.add_argument("--output", help="Write per-trace results as JSON lines", default=None)
+    parser.add_argument("--baseline", help="Results of an earlier replay (--output) to compare against",
+                        default=None)
+    args = parser.parse_args()
+
+    results = asyncio.run(replay(args.trace_log, args.base_url, args.speed, args.route))
+    if not results:
+        print("No replayable traces found")
+        return
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = {r["trace_id"]: r for r in map(json.loads, f)}
+
+    report(results, baseline)
+    throttled = sum(1 for r in results if r["replay_status"] == 429 and r["original_status"] != 429)
+    if throttled:
+        print(f"\nWarning: {throttled} replayed request(s) were rate limited (429). Start the app with "
+              f"MAITRI_REPLAY=1 to rate-limit per recorded client, or raise MAITRI_CLIENT_RATE / "
+              f"MAITRI_CLIENT_BURST for the replay.")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ from services.speech_to_text import transcribe_audio, detect_language
 from services.intent_classification import classify_intent, generate_response
 from services.scheme_matching import match_schemes, get_scheme_by_id
 from services.text_to_speech import generate_speech, generate_empathetic_speech
+from services.voice_profiles import get_tts_model, voice_registry
 
 # Import routers
 from routes.audio import router as audio_router
@@ -45,6 +46,21 @@ app.add_middleware(
 os.makedirs("temp_audio", exist_ok=True)
 os.makedirs("temp_uploads", exist_ok=True)
 
+def warm_up_tts() -> None:
+    get_tts_model()
+    voice_registry.warm_up()
+
+@app.on_event("startup")
+async def warm_up_voice_models():
+    # Load XTTS and the default voice before serving, so the first TTS requests
+    # don't pay for it inside an inference slot under their deadline
+    if os.getenv("MAITRI_TTS_WARM_UP", "1") != "1":
+        return
+    try:
+        await asyncio.to_thread(warm_up_tts)
+    except Exception as e:
+        logger.error(f"TTS warm-up failed, the model will load on first use: {str(e)}")
+
 # Define request/response models
 class ProcessAudioResponse(BaseModel):
     text: str
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Request
 from fastapi.responses import FileResponse
 import os
 import uuid
@@ -6,50 +6,80 @@ import logging
 
 from services.speech_to_text import transcribe_audio
 from services.text_to_speech import generate_speech, generate_empathetic_speech
+from services.scheduler import scheduler, PRIORITY_CATALOG, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from services.tracing import capture_trace
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/audio", tags=["audio"])
 
+def _request_priority(request: Request) -> int:
+    # Clients doing bulk work can opt into the batch class
+    if request.headers.get("X-Priority", "").lower() == "batch":
+        return PRIORITY_BATCH
+    return PRIORITY_INTERACTIVE
+
 @router.post("/text-to-speech")
-async def text_to_speech(text: str):
+async def text_to_speech(text: str, request: Request):
     try:
-        output_path = await generate_speech(text)
+        async with capture_trace(request, "/audio/text-to-speech", text=text):
+            output_path = await scheduler.run(
+                request, lambda: generate_speech(text), priority=_request_priority(request)
+            )
         return FileResponse(output_path, media_type="audio/wav")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/speech-to-text")
-async def speech_to_text(audio_file: UploadFile = File(...)):
+async def speech_to_text(request: Request, audio_file: UploadFile = File(...)):
+    temp_file_path = f"temp_uploads/{uuid.uuid4()}.wav"
     try:
-        temp_file_path = f"temp_uploads/{uuid.uuid4()}.wav"
         with open(temp_file_path, "wb") as temp_file:
             content = await audio_file.read()
             temp_file.write(content)
         
-        text = await transcribe_audio(temp_file_path)
-        os.remove(temp_file_path)
+        async with capture_trace(request, "/audio/speech-to-text", audio=content, audio_path=temp_file_path):
+            text = await scheduler.run(
+                request, lambda: transcribe_audio(temp_file_path), priority=_request_priority(request)
+            )
         return {"text": text}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
 
 @router.post("/process")
-async def speech_to_text(audio_file: UploadFile = File(...)):
+async def speech_to_text(request: Request, audio_file: UploadFile = File(...)):
+    temp_file_path = f"temp_uploads/{uuid.uuid4()}.wav"
     try:
-        temp_file_path = f"temp_uploads/{uuid.uuid4()}.wav"
         with open(temp_file_path, "wb") as temp_file:
             content = await audio_file.read()
             temp_file.write(content)
         
-        text = await transcribe_audio(temp_file_path)
-        os.remove(temp_file_path)
+        async with capture_trace(request, "/audio/process", audio=content, audio_path=temp_file_path):
+            text = await scheduler.run(
+                request, lambda: transcribe_audio(temp_file_path), priority=_request_priority(request)
+            )
         return {"text": text}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
 
 @router.get("/{filename}")
-async def get_audio(filename: str):
-    file_path = f"temp_audio/{filename}"
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Audio file not found")
-    return FileResponse(file_path, media_type="audio/mpeg")
\ No newline at end of file
+async def get_audio(filename: str, request: Request):
+    async def lookup():
+        file_path = f"temp_audio/{filename}"
+        if not os.path.exists(file_path):
+            raise HTTPException(status_code=404, detail="Audio file not found")
+        return FileResponse(file_path, media_type="audio/mpeg")
+
+    return await scheduler.run(request, lookup, priority=PRIORITY_CATALOG)
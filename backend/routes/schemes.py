@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
-from services.scheme_matching import match_schemes, get_scheme_by_id, SCHEMES_DB
+from services.scheme_matching import match_schemes, get_scheme_by_id, SCHEME_CATALOG
+from services.scheduler import scheduler, PRIORITY_CATALOG
 
 router = APIRouter(prefix="/schemes", tags=["schemes"])
 
@@ -9,12 +10,17 @@ class SchemeRequest(BaseModel):
     scheme_id: str
 
 @router.get("/")
-async def get_all_schemes():
-    return {"schemes": SCHEMES_DB}
+async def get_all_schemes(request: Request):
+    async def lookup():
+        return {"schemes": SCHEME_CATALOG.to_dicts()}
+
+    return await scheduler.run(request, lookup, priority=PRIORITY_CATALOG)
 
 @router.post("/")
-async def get_scheme(request: SchemeRequest):
-    scheme = await get_scheme_by_id(request.scheme_id)
+async def get_scheme(scheme_request: SchemeRequest, request: Request):
+    scheme = await scheduler.run(
+        request, lambda: get_scheme_by_id(scheme_request.scheme_id), priority=PRIORITY_CATALOG
+    )
     if not scheme:
         raise HTTPException(status_code=404, detail="Scheme not found")
-    return {"scheme": scheme}
\ No newline at end of file
+    return {"scheme": scheme}
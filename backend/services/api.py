@@ -1,15 +1,79 @@
 import os
-import requests
+import json
+import asyncio
+import hashlib
+import logging
+import aiohttp
+import aiofiles
+from collections import OrderedDict
 from fastapi import UploadFile, HTTPException
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from .speech_to_text import transcribe_audio
 from .intent_classification import classify_intent
 from .scheme_matching import match_schemes
 from .text_to_speech import generate_speech
 
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+CACHE_INDEX = "index.json"
+
+
+class AudioTooLargeError(ValueError):
+    """Raised when a download exceeds max_download_bytes."""
+
+
 class APIClient:
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        download_dir: str = "temp_uploads",
+        max_download_bytes: int = 20 * 1024 * 1024,
+        max_cache_entries: int = 256,
+        max_cache_bytes: int = 200 * 1024 * 1024,
+        max_connections: int = 8,
+        timeout: float = 30.0,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
         self.base_url = base_url
+        self.download_dir = download_dir
+        self.max_download_bytes = max_download_bytes
+        self.max_cache_entries = max_cache_entries
+        self.max_cache_bytes = max_cache_bytes
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        # Shared keep-alive connection pool, created lazily inside the running loop
+        self._session = session
+        self._owns_session = session is None
+
+        # Local content cache in LRU order: url -> {"path", "size", "etag", "last_modified"}
+        self._cache_index_path = os.path.join(download_dir, CACHE_INDEX)
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = self._load_cache_index()
+        self._evict_cache()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def __aenter__(self) -> "APIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the shared HTTP session if this client created it."""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._owns_session = True
+        return self._session
     
     async def process_audio(self, audio_data: dict) -> dict:
         """
@@ -56,27 +120,155 @@ class APIClient:
             
         Returns:
             Local path to downloaded audio file
+
+        Raises:
+            HTTPException: 413 if the audio is larger than max_download_bytes,
+                500 for any other failure
         """
         try:
             if audio_url.startswith('http'):
-                # Download from external URL
-                response = requests.get(audio_url)
-                response.raise_for_status()
-                
-                # Save to temp file
-                temp_path = os.path.join('temp_uploads', os.path.basename(audio_url))
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-                
-                return temp_path
+                # Concurrent requests for the same URL share a single download
+                task = self._inflight.get(audio_url)
+                if task is None:
+                    task = asyncio.ensure_future(self._fetch(audio_url))
+                    self._inflight[audio_url] = task
+                    task.add_done_callback(lambda _: self._inflight.pop(audio_url, None))
+                return await asyncio.shield(task)
             else:
                 # Local file path
                 if not os.path.exists(audio_url):
                     raise FileNotFoundError(f"Audio file not found at {audio_url}")
                 return audio_url
-                
+
+        except AudioTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
         except Exception as e:
             raise HTTPException(
                 status_code=500, 
                 detail=f"Error downloading audio: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def prefetch_audio(self, audio_urls: List[str]) -> Dict[str, str]:
+        """
+        Download several audio files concurrently over the shared connection pool
+        
+        Args:
+            audio_urls: URLs or paths to audio files
+            
+        Returns:
+            Dict mapping each successfully fetched URL to its local path
+        """
+        unique_urls = list(dict.fromkeys(audio_urls))
+        results = await asyncio.gather(
+            *(self.download_audio_response(url) for url in unique_urls),
+            return_exceptions=True
+        )
+
+        paths = {}
+        for url, result in zip(unique_urls, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to prefetch {url}: {str(result)}")
+            else:
+                paths[url] = result
+        return paths
+
+    async def _fetch(self, audio_url: str) -> str:
+        cached = self._cache.get(audio_url)
+        if cached and not os.path.exists(cached["path"]):
+            cached = None
+
+        # Revalidate cached content instead of downloading it again
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        session = self._get_session()
+        async with session.get(audio_url, headers=headers) as response:
+            if response.status == 304 and cached:
+                logger.info(f"Audio not modified, using cached copy of {audio_url}")
+                self._cache.move_to_end(audio_url)
+                self._save_cache_index()
+                return cached["path"]
+            response.raise_for_status()
+
+            if response.content_length is not None and response.content_length > self.max_download_bytes:
+                raise AudioTooLargeError(
+                    f"Audio file too large ({response.content_length} bytes, limit {self.max_download_bytes})"
+                )
+
+            os.makedirs(self.download_dir, exist_ok=True)
+            temp_path = os.path.join(self.download_dir, self._cache_filename(audio_url))
+            part_path = f"{temp_path}.part"
+
+            # Stream to disk in chunks, enforcing the size cap as we go
+            received = 0
+            try:
+                async with aiofiles.open(part_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        received += len(chunk)
+                        if received > self.max_download_bytes:
+                            raise AudioTooLargeError(f"Audio file exceeds limit of {self.max_download_bytes} bytes")
+                        await f.write(chunk)
+                os.replace(part_path, temp_path)
+            except BaseException:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+
+            self._cache.pop(audio_url, None)
+            self._cache[audio_url] = {
+                "path": temp_path,
+                "size": received,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            self._evict_cache()
+            self._save_cache_index()
+            return temp_path
+
+    def _evict_cache(self) -> None:
+        # Drop least recently used entries (never the newest) until within limits
+        total = sum(entry.get("size", 0) for entry in self._cache.values())
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.max_cache_entries or total > self.max_cache_bytes
+        ):
+            url, entry = self._cache.popitem(last=False)
+            total -= entry.get("size", 0)
+            try:
+                os.remove(entry["path"])
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove evicted cache file {entry['path']}: {str(e)}")
+            logger.info(f"Evicted cached audio for {url}")
+
+    def _cache_filename(self, audio_url: str) -> str:
+        # Hash the URL so different URLs sharing a basename don't collide
+        name = os.path.basename(audio_url.split('?', 1)[0]) or "audio"
+        digest = hashlib.sha1(audio_url.encode("utf-8")).hexdigest()[:16]
+        return f"{digest}_{name}"
+
+    def _load_cache_index(self) -> "OrderedDict[str, Dict[str, Any]]":
+        try:
+            with open(self._cache_index_path, "r", encoding="utf-8") as f:
+                index = json.load(f, object_pairs_hook=OrderedDict)
+        except (FileNotFoundError, ValueError):
+            return OrderedDict()
+
+        # Forget entries whose file is gone; older indexes did not record sizes
+        cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for url, entry in index.items():
+            if os.path.exists(entry["path"]):
+                entry.setdefault("size", os.path.getsize(entry["path"]))
+                cache[url] = entry
+        return cache
+
+    def _save_cache_index(self) -> None:
+        os.makedirs(self.download_dir, exist_ok=True)
+        tmp_path = f"{self._cache_index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_path, self._cache_index_path)
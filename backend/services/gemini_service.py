@@ -1,28 +1,31 @@
-import os
 import logging
-import google.generativeai as genai
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from .llm_gateway import create_default_gateway
+from .intent_classification import generate_response as generate_template_response
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-# Configure Gemini API
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if not GEMINI_API_KEY:
-    raise ValueError('GEMINI_API_KEY environment variable is not set')
-
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-pro')
+# Gemini is reached through the gateway, which is configured lazily so a
+# missing GEMINI_API_KEY degrades to template responses instead of failing import
+gateway = create_default_gateway()
 
-async def generate_response(text: str) -> str:
+async def generate_response(
+    text: str,
+    intent_data: Optional[Dict[str, Any]] = None,
+    matched_schemes: Optional[List[Dict[str, Any]]] = None,
+) -> str:
     """
     Generate a response using Gemini API based on user's transcribed text.
     
     Args:
         text: The transcribed text from user's speech
+        intent_data: Intent classification result, used by the local fallback
+        matched_schemes: Matched schemes, used by the local fallback
         
     Returns:
-        Generated response text
+        Generated response text (or a template response if Gemini is unavailable)
     """
     try:
         logger.info(f"Generating response for: {text[:50]}...")
@@ -32,13 +35,19 @@ async def generate_response(text: str) -> str:
         Please provide a natural and helpful response to: {text}
         Keep the response concise and conversational."""
         
-        # Generate response
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        async def fallback() -> str:
+            logger.info("Falling back to template response")
+            return await generate_template_response(
+                intent_data or {"intent": "general_inquiry", "scheme": None, "user_profile": {}},
+                matched_schemes or []
+            )
+        
+        # Generate response with deadline, hedging and circuit breaker
+        response_text = await gateway.generate(prompt, fallback=fallback)
         
         logger.info(f"Generated response: {response_text[:50]}...")
         return response_text
         
     except Exception as e:
         logger.error(f"Error generating response: {str(e)}")
-        raise
\ No newline at end of file
+        raise
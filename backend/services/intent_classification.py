@@ -4,11 +4,14 @@ import asyncio
 from typing import Dict, List, Any, Optional
 import json
 
+from .tracing import traced
+
 # In a production environment, you would import the actual Gemini API library
 # import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
+@traced("classify_intent", summarize=lambda r: {"intent": r.get("intent"), "scheme": r.get("scheme")})
 async def classify_intent(text: str) -> Dict[str, Any]:
     """
     Classify the intent of the user's query using GeminiAPI.
@@ -0,0 +1,285 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# A timed-out call only counts against the breaker if the backend itself had at
+# least this share of the deadline (the rest may have gone to the local queue)
+BACKEND_SHARE = 0.5
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the LLM backend cannot answer within the gateway's budget."""
+
+
+class GeminiBackend:
+    """
+    Gemini backend, configured lazily so a missing key does not break app import.
+
+    Args:
+        model_name: Gemini model to use
+        api_key: API key (defaults to GEMINI_API_KEY)
+    """
+
+    def __init__(self, model_name: str = "gemini-pro", api_key: Optional[str] = None):
+        self.model_name = model_name
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self._model = None
+
+    def _get_model(self):
+        if self._model is None:
+            if not self.api_key:
+                raise LLMUnavailableError("GEMINI_API_KEY environment variable is not set")
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    async def generate(self, prompt: str) -> str:
+        response = await self._get_model().generate_content_async(prompt)
+        return response.text.strip()
+
+
+class FakeLLMBackend:
+    """
+    Local stand-in for the LLM with injectable latency and failures.
+
+    Args:
+        latency: Seconds per call, or a callable returning seconds (e.g. a sampler
+            for a heavy-tailed distribution)
+        error_rate: Probability that a call raises
+        response: Text returned by successful calls
+        seed: Seed for the failure sampler
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Callable[[], float]] = 0.05,
+        error_rate: float = 0.0,
+        response: str = "नमस्ते बहन! मैं आपकी मदद कर सकती हूँ।",
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.response = response
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def generate(self, prompt: str) -> str:
+        self.calls += 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        await asyncio.sleep(delay)
+        if self._random.random() < self.error_rate:
+            raise RuntimeError("Fake LLM backend failure")
+        return self.response
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures and lets a single probe through after a cool-down.
+
+    Args:
+        failure_threshold: Consecutive failures before the breaker opens
+        reset_timeout: Seconds to stay open before allowing a probe
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        # A cancelled probe proves nothing either way, let the next call probe
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._probing:
+                logger.warning(f"LLM circuit breaker opened after {self.failures} failure(s)")
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class _Attempt:
+    """When the first call for a generate() request got hold of the semaphore."""
+
+    __slots__ = ("started_at",)
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+
+    def backend_time(self) -> float:
+        return 0.0 if self.started_at is None else time.monotonic() - self.started_at
+
+
+class LLMGateway:
+    """
+    Wraps an LLM backend with deadlines, bounded concurrency, hedged requests
+    and a circuit breaker, degrading to a local fallback when the backend
+    is slow or unavailable.
+
+    Args:
+        backend: Object with an async generate(prompt) method
+        timeout: Per-call deadline in seconds, including any hedge
+        max_concurrency: Maximum backend calls in flight (hedges included)
+        hedge_percentile: Latency percentile after which a duplicate request is sent
+        initial_hedge_delay: Hedge delay used until enough latencies are observed
+        breaker: Circuit breaker (a default one is created if omitted)
+    """
+
+    def __init__(
+        self,
+        backend,
+        timeout: float = 8.0,
+        max_concurrency: int = 4,
+        hedge_percentile: float = 0.95,
+        initial_hedge_delay: float = 2.0,
+        breaker: Optional[CircuitBreaker] = None,
+        latency_window: int = 200,
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def hedge_delay(self) -> float:
+        """Current hedge delay: the observed latency percentile, or the initial delay."""
+        if len(self._latencies) < 20:
+            return self.initial_hedge_delay
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile))
+        return ordered[index]
+
+    async def generate(
+        self,
+        prompt: str,
+        fallback: Optional[Callable[[], Awaitable[str]]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Generate a completion, falling back locally on timeout, error or open breaker.
+
+        Args:
+            prompt: Prompt text
+            fallback: Coroutine function producing a local response
+            timeout: Override for the per-call deadline
+
+        Returns:
+            Generated (or fallback) response text
+        """
+        if not self.breaker.allow_request():
+            logger.warning("LLM circuit breaker open, using local fallback")
+            return await self._fallback(fallback, LLMUnavailableError("Circuit breaker open"))
+
+        deadline = timeout or self.timeout
+        attempt = _Attempt()
+        try:
+            result = await asyncio.wait_for(self._hedged(prompt, attempt), deadline)
+            self.breaker.record_success()
+            return result
+        except asyncio.CancelledError:
+            self.breaker.release_probe()
+            raise
+        except asyncio.TimeoutError:
+            # Time spent queued behind our own concurrency limit says nothing about
+            # the backend; only blame it if it had a fair share of the deadline
+            if attempt.backend_time() >= deadline * BACKEND_SHARE:
+                self.breaker.record_failure()
+                logger.warning(f"LLM call exceeded {deadline:.1f}s deadline")
+            else:
+                self.breaker.release_probe()
+                logger.warning(f"LLM call spent its {deadline:.1f}s deadline waiting for a free slot")
+            return await self._fallback(fallback, LLMUnavailableError("LLM deadline exceeded"))
+        except Exception as e:
+            self.breaker.record_failure()
+            logger.error(f"LLM call failed: {str(e)}")
+            return await self._fallback(fallback, e)
+
+    async def _fallback(self, fallback: Optional[Callable[[], Awaitable[str]]], error: Exception) -> str:
+        if fallback is None:
+            raise error
+        return await fallback()
+
+    async def _call(self, prompt: str, attempt: "_Attempt") -> str:
+        async with self._semaphore:
+            started_at = time.monotonic()
+            if attempt.started_at is None:
+                attempt.started_at = started_at
+            result = await self.backend.generate(prompt)
+            self._latencies.append(time.monotonic() - started_at)
+            return result
+
+    async def _hedged(self, prompt: str, attempt: "_Attempt") -> str:
+        primary = asyncio.create_task(self._call(prompt, attempt))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+
+            # Only hedge when there is spare capacity, never queue a duplicate
+            if not done and not self._semaphore.locked():
+                logger.info("LLM call slower than hedge threshold, sending hedged request")
+                tasks.add(asyncio.create_task(self._call(prompt, attempt)))
+
+            # Return the first successful answer, surface the error only if all fail
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks | {primary}:
+                task.cancel()
+
+
+def create_default_gateway() -> LLMGateway:
+    """Build the gateway from environment settings (MAITRI_LLM_BACKEND=fake for offline use)."""
+    if os.getenv("MAITRI_LLM_BACKEND", "gemini") == "fake":
+        backend = FakeLLMBackend(latency=float(os.getenv("MAITRI_FAKE_LLM_LATENCY", "0.05")))
+    else:
+        backend = GeminiBackend()
+
+    return LLMGateway(
+        backend,
+        timeout=float(os.getenv("MAITRI_LLM_TIMEOUT", "8.0")),
+        max_concurrency=int(os.getenv("MAITRI_LLM_MAX_CONCURRENCY", "4")),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("MAITRI_LLM_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("MAITRI_LLM_BREAKER_RESET", "30.0")),
+        ),
+    )
@@ -0,0 +1,363 @@
+import os
+import time
+import heapq
+import asyncio
+import logging
+import functools
+import itertools
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, Request
+
+from .tracing import current_trace
+
+logger = logging.getLogger(__name__)
+
+# Priority classes (lower value is served first)
+PRIORITY_CATALOG = 0      # Cheap lookups, never wait for an inference slot
+PRIORITY_INTERACTIVE = 1  # A user is waiting on the other end of the voice turn
+PRIORITY_BATCH = 2        # Background / bulk work
+
+# Default deadline (seconds) per priority class
+DEFAULT_DEADLINES = {
+    PRIORITY_CATALOG: 5.0,
+    PRIORITY_INTERACTIVE: 60.0,
+    PRIORITY_BATCH: 300.0,
+}
+
+# Tokens taken from the client's bucket per request
+REQUEST_COST = {
+    PRIORITY_CATALOG: 0.25,
+    PRIORITY_INTERACTIVE: 1.0,
+    PRIORITY_BATCH: 1.0,
+}
+
+# Header a client can use to ask for a shorter deadline (seconds)
+DEADLINE_HEADER = "X-Request-Timeout"
+
+# Bound on tracked clients, and how often idle buckets are swept (seconds)
+MAX_TRACKED_CLIENTS = 10000
+BUCKET_SWEEP_INTERVAL = 60.0
+
+# Replay tooling (benchmarks/replay_traces.py) sends the anonymized client key
+# recorded in each trace here. It is only trusted from loopback when the app
+# runs with MAITRI_REPLAY=1, so replayed traffic is rate limited per original client.
+REPLAY_CLIENT_HEADER = "X-Replay-Client"
+REPLAY_MODE = os.getenv("MAITRI_REPLAY", "0") == "1"
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+# HTTP status used when the client goes away (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+
+class InferenceAbandoned(Exception):
+    """Raised inside a worker thread when the request it was serving has gone away."""
+
+
+class _SlotLease:
+    """
+    Tracks the worker threads started while holding an inference slot, so the
+    slot is only handed on once the last of them has really finished.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor):
+        self.executor = executor
+        self.pending: Set[Future] = set()
+        self.abandoned = False
+        self._on_idle: Optional[Callable[[], None]] = None
+
+    def release_when_idle(self, release: Callable[[], None]) -> None:
+        self.abandoned = True
+        if self.pending:
+            self._on_idle = release
+        else:
+            release()
+
+    def thread_done(self, future: Future) -> None:
+        # Always called on the event loop thread
+        self.pending.discard(future)
+        if not self.pending and self._on_idle is not None:
+            release, self._on_idle = self._on_idle, None
+            release()
+
+
+_current_lease: contextvars.ContextVar[Optional[_SlotLease]] = contextvars.ContextVar("maitri_slot_lease", default=None)
+
+
+async def run_inference(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run blocking inference (Whisper, XTTS) in a worker thread.
+
+    Inside a scheduled job the thread is tied to the job's inference slot: if the
+    request is abandoned the result is dropped, but the slot stays taken until
+    the thread returns, and no further inference is started for that request.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    lease = _current_lease.get()
+    if lease is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    if lease.abandoned:
+        raise InferenceAbandoned("Request abandoned before inference started")
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    future = lease.executor.submit(context.run, functools.partial(func, *args, **kwargs))
+    lease.pending.add(future)
+    future.add_done_callback(lambda f: loop.call_soon_threadsafe(lease.thread_done, f))
+    return await asyncio.wrap_future(future)
+
+
+def raise_if_abandoned() -> None:
+    """Checkpoint for multi-step inference running in a worker thread."""
+    lease = _current_lease.get()
+    if lease is not None and lease.abandoned:
+        raise InferenceAbandoned("Request abandoned, skipping remaining inference steps")
+
+
+class TokenBucket:
+    """
+    Classic token bucket used for per-client admission control.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum number of tokens the bucket can hold (burst size)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def is_idle_full(self, now: float) -> bool:
+        # A bucket that would be full again carries no state worth keeping
+        return self.tokens + (now - self.updated_at) * self.rate >= self.capacity
+
+    def consume(self, tokens: float = 1.0) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+
+class RequestScheduler:
+    """
+    Schedules request handlers with priorities, deadlines and per-client admission.
+
+    Inference work (interactive and batch) shares a fixed number of slots that
+    are handed out in priority order. Jobs must offload blocking inference via
+    run_inference() so a slot stays taken until its worker thread is done. Catalog work skips the slot pool so it
+    never queues behind Whisper/XTTS. Work that is still queued or running is
+    cancelled when the client disconnects or its deadline passes.
+
+    Clients are identified by request.client.host. Behind a reverse proxy
+    (Render, Railway, Fly.io) that is the proxy's address unless uvicorn runs
+    with --proxy-headers and --forwarded-allow-ips (or FORWARDED_ALLOW_IPS)
+    set to the proxy, otherwise every user shares one bucket.
+
+    Args:
+        max_concurrent: Number of inference jobs allowed to run at once
+        rate: Per-client token refill rate (tokens per second)
+        burst: Per-client bucket capacity
+        poll_interval: Seconds between client disconnect checks
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        rate: float = 1.0,
+        burst: float = 5.0,
+        poll_interval: float = 0.5,
+    ):
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = burst
+        self.poll_interval = poll_interval
+
+        self._free_slots = max_concurrent
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._last_sweep = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="inference")
+
+    async def run(
+        self,
+        request: Request,
+        job: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """
+        Run a job on behalf of a request.
+
+        Args:
+            request: Incoming request, used for client identity and disconnect checks
+            job: Zero-argument coroutine function doing the actual work
+            priority: One of the PRIORITY_* classes
+            deadline: Deadline in seconds (defaults to the class deadline)
+
+        Returns:
+            Whatever the job returns
+
+        Raises:
+            HTTPException: 429 if the client is over its rate, 504 if the deadline
+                passes, 499 if the client disconnects
+        """
+        client_id = client_identity(request)
+        if not self._admit(client_id, priority):
+            logger.warning(f"Rejected request from {client_id}: rate limit exceeded")
+            raise HTTPException(status_code=429, detail="Too many requests")
+
+        timeout = self._resolve_deadline(request, priority, deadline)
+        task = asyncio.create_task(self._execute(job, priority))
+        watcher = asyncio.create_task(self._wait_for_disconnect(request))
+
+        try:
+            done, _ = await asyncio.wait(
+                {task, watcher},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        except asyncio.CancelledError:
+            await self._cancel(task)
+            raise
+        finally:
+            watcher.cancel()
+
+        if task in done:
+            return task.result()
+
+        await self._cancel(task)
+        if watcher in done:
+            logger.info(f"Client {client_id} disconnected, cancelled {request.url.path}")
+            raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected")
+
+        logger.warning(f"Deadline of {timeout:.1f}s exceeded for {request.url.path}")
+        raise HTTPException(status_code=504, detail="Request deadline exceeded")
+
+    def _admit(self, client_id: str, priority: int) -> bool:
+        self._sweep_buckets()
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = self._buckets[client_id] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                # Least recently seen client goes first
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+        return bucket.consume(REQUEST_COST.get(priority, 1.0))
+
+    def _sweep_buckets(self) -> None:
+        now = time.monotonic()
+        if now - self._last_sweep < BUCKET_SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        idle = [client for client, bucket in self._buckets.items() if bucket.is_idle_full(now)]
+        for client in idle:
+            del self._buckets[client]
+
+    def _resolve_deadline(self, request: Request, priority: int, deadline: Optional[float]) -> float:
+        limit = deadline if deadline is not None else DEFAULT_DEADLINES.get(priority, DEFAULT_DEADLINES[PRIORITY_BATCH])
+
+        # Clients may tighten the deadline but never extend it
+        requested = request.headers.get(DEADLINE_HEADER)
+        if requested:
+            try:
+                value = float(requested)
+                if value > 0:
+                    limit = min(limit, value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid {DEADLINE_HEADER} header: {requested}")
+        return limit
+
+    async def _execute(self, job: Callable[[], Awaitable[Any]], priority: int) -> Any:
+        if priority <= PRIORITY_CATALOG:
+            return await job()
+
+        trace = current_trace()
+        queued_at = trace.elapsed_ms() if trace is not None else 0.0
+        await self._acquire(priority)
+        if trace is not None:
+            # Time spent waiting for an inference slot
+            trace.stages.append({
+                "name": "queue_wait",
+                "start_ms": queued_at,
+                "ms": round(trace.elapsed_ms() - queued_at, 2),
+            })
+        lease = _SlotLease(self._executor)
+        token = _current_lease.set(lease)
+        try:
+            return await job()
+        finally:
+            _current_lease.reset(token)
+            # Worker threads cannot be interrupted; keep the slot until they return
+            lease.release_when_idle(self._release)
+
+    async def _acquire(self, priority: int) -> None:
+        if self._free_slots > 0 and not self._waiters:
+            self._free_slots -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before we were cancelled
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot to the highest priority waiter that is still alive
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._free_slots += 1
+
+    async def _wait_for_disconnect(self, request: Request) -> None:
+        while not await request.is_disconnected():
+            await asyncio.sleep(self.poll_interval)
+
+    async def _cancel(self, task: asyncio.Task) -> None:
+        # Inference already running in a worker thread finishes in the background
+        # (still holding its slot) and its result is discarded
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def client_identity(request: Request) -> str:
+    """Key used for per-client admission control."""
+    host = request.client.host if request.client else "unknown"
+    if REPLAY_MODE and host in LOOPBACK_HOSTS:
+        replayed = request.headers.get(REPLAY_CLIENT_HEADER)
+        if replayed:
+            return f"replay:{replayed}"
+    return host
+
+
+# Shared scheduler for all routes
+scheduler = RequestScheduler(
+    max_concurrent=int(os.getenv("MAITRI_MAX_CONCURRENT_INFERENCE", "2")),
+    rate=float(os.getenv("MAITRI_CLIENT_RATE", "1.0")),
+    burst=float(os.getenv("MAITRI_CLIENT_BURST", "5")),
+)
@@ -0,0 +1,327 @@
+import sys
+import logging
+from array import array
+from itertools import chain
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Criterion kinds, used to rebuild the original dict shape
+CRITERION_SCALAR = 0  # "has_lpg_connection": False
+CRITERION_ANY_OF = 1  # "income_level": ["bpl", "low"]
+
+# match() checks blocks one at a time until it has checked 1/INDEX_COST_RATIO
+# as many blocks as the inverted index would touch, then switches to the index.
+# Short limited lookups (top 3) never pay for the index.
+INDEX_COST_RATIO = 16
+
+
+class Vocabulary:
+    """
+    Interns values as small integer ids.
+
+    Values are stored once, keyed by (type, value) so decoding gives back
+    exactly what was stored. A second index keyed by the raw value lets
+    lookups follow Python equality (True == 1), like the original dict matcher.
+    """
+
+    def __init__(self):
+        self._values: List[Any] = []
+        self._ids: Dict[Tuple[type, Hashable], int] = {}
+        self._equal_ids: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, value: Any) -> int:
+        key = (type(value), value)
+        value_id = self._ids.get(key)
+        if value_id is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            value_id = len(self._values)
+            self._values.append(value)
+            self._ids[key] = value_id
+            self._equal_ids[value] = self._equal_ids.get(value, ()) + (value_id,)
+        return value_id
+
+    def get(self, value: Any) -> Optional[int]:
+        """Id of exactly this value, or None if it was never interned."""
+        try:
+            return self._ids.get((type(value), value))
+        except TypeError:
+            return None
+
+    def ids_equal_to(self, value: Any) -> Tuple[int, ...]:
+        """Ids of every interned value that compares equal to value."""
+        try:
+            return self._equal_ids.get(value, ())
+        except TypeError:
+            # Unhashable values (lists, dicts) never equal an interned scalar
+            return ()
+
+    def value(self, value_id: int) -> Any:
+        return self._values[value_id]
+
+
+class SchemeRecord:
+    """
+    Compact, slot-based scheme entry.
+
+    Documents and steps are arrays of vocabulary ids. Criteria are packed into
+    one array as repeated [key_id, kind, count, value_id * count] groups, shared
+    with every record that has the same criteria; `block` numbers that array.
+    """
+
+    __slots__ = ("id", "title", "description", "eligibility", "benefits",
+                 "documents", "steps", "criteria", "block", "extra")
+
+    def __init__(self, id: str, title: str, description: str, eligibility: str, benefits: str,
+                 documents: array, steps: array, criteria: Optional[array], block: Optional[int],
+                 extra: Optional[Dict[str, Any]]):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.eligibility = eligibility
+        self.benefits = benefits
+        self.documents = documents
+        self.steps = steps
+        self.criteria = criteria
+        self.block = block
+        self.extra = extra
+
+    def iter_criteria(self) -> Iterator[Tuple[int, int, array]]:
+        """Yield (key_id, kind, value_ids) for each packed criterion."""
+        packed = self.criteria
+        if packed is None:
+            return
+        i = 0
+        while i < len(packed):
+            key_id, kind, count = packed[i], packed[i + 1], packed[i + 2]
+            yield key_id, kind, packed[i + 3:i + 3 + count]
+            i += 3 + count
+
+
+# Top-level keys mapped onto record fields; anything else is kept in `extra`
+_FIELDS = ("id", "title", "description", "eligibility", "eligibility_criteria",
+           "documents", "steps", "benefits")
+
+
+class SchemeCatalog:
+    """
+    Memory-compact scheme catalog.
+
+    Repeated strings (documents, steps, criteria keys and values) are stored
+    once in shared vocabularies and referenced by integer id, and identical
+    criteria blocks are shared between records. Schemes are only
+    converted back to the plain dict shape at the API boundary via to_dict().
+
+    Matching uses an inverted index over criteria blocks: for each criteria key
+    the blocks that constrain it, and for each (key, value) pair the blocks that
+    accept it, both as arrays of block numbers.
+    """
+
+    def __init__(self):
+        self.documents = Vocabulary()
+        self.steps = Vocabulary()
+        self.criteria_keys = Vocabulary()
+        self.criteria_values = Vocabulary()
+        self._records: List[SchemeRecord] = []
+        self._by_id: Dict[str, SchemeRecord] = {}
+        # Identical criteria blocks are shared between records
+        self._criteria_pool: Dict[bytes, int] = {}
+        self._blocks: List[array] = []
+        self._constrained: Dict[int, array] = {}
+        self._accepted: Dict[Tuple[int, int], array] = {}
+
+    @classmethod
+    def from_dicts(cls, schemes: Iterable[Dict[str, Any]]) -> "SchemeCatalog":
+        catalog = cls()
+        for scheme in schemes:
+            catalog.add(scheme)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[SchemeRecord]:
+        return iter(self._records)
+
+    def add(self, scheme: Dict[str, Any]) -> SchemeRecord:
+        """
+        Pack a scheme dict into a record and add it to the catalog.
+
+        Args:
+            scheme: Scheme in the SCHEMES_DB dict shape
+
+        Returns:
+            The stored SchemeRecord
+        """
+        criteria = block = None
+        if "eligibility_criteria" in scheme:
+            criteria = array("I")
+            for key, value in scheme["eligibility_criteria"].items():
+                if isinstance(value, list):
+                    value_ids = [self.criteria_values.add(v) for v in value]
+                    kind = CRITERION_ANY_OF
+                else:
+                    value_ids = [self.criteria_values.add(value)]
+                    kind = CRITERION_SCALAR
+                criteria.extend((self.criteria_keys.add(key), kind, len(value_ids)))
+                criteria.extend(value_ids)
+            block = self._add_block(criteria)
+            criteria = self._blocks[block]
+
+        extra = {k: v for k, v in scheme.items() if k not in _FIELDS} or None
+        record = SchemeRecord(
+            id=scheme["id"],
+            title=scheme.get("title"),
+            description=scheme.get("description"),
+            eligibility=_intern(scheme.get("eligibility")),
+            benefits=_intern(scheme.get("benefits")),
+            documents=array("I", (self.documents.add(d) for d in scheme.get("documents", []))),
+            steps=array("I", (self.steps.add(s) for s in scheme.get("steps", []))),
+            criteria=criteria,
+            block=block,
+            extra=extra,
+        )
+
+        self._records.append(record)
+        self._by_id[record.id] = record
+        return record
+
+    def _add_block(self, criteria: array) -> int:
+        key = criteria.tobytes()
+        block = self._criteria_pool.get(key)
+        if block is not None:
+            return block
+
+        block = self._criteria_pool[key] = len(self._blocks)
+        self._blocks.append(criteria)
+        i = 0
+        while i < len(criteria):
+            key_id, count = criteria[i], criteria[i + 2]
+            self._constrained.setdefault(key_id, array("I")).append(block)
+            for value_id in criteria[i + 3:i + 3 + count]:
+                self._accepted.setdefault((key_id, value_id), array("I")).append(block)
+            i += 3 + count
+        return block
+
+    def get(self, scheme_id: str) -> Optional[SchemeRecord]:
+        return self._by_id.get(scheme_id)
+
+    def match(self, user_profile: Dict[str, Any], limit: Optional[int] = None) -> List[SchemeRecord]:
+        """
+        Find schemes whose eligibility criteria fit the user profile.
+
+        Criteria whose key is missing from the profile are ignored, so the
+        semantics are the same as the original dict-based matcher.
+
+        Args:
+            user_profile: Dictionary containing user profile information
+            limit: Maximum number of schemes to return
+
+        Returns:
+            Matching scheme records in catalog order
+        """
+        # Translate the profile to value ids once instead of per scheme
+        profile_ids: Dict[int, Tuple[int, ...]] = {}
+        for key, value in user_profile.items():
+            key_id = self.criteria_keys.get(key)
+            if key_id is not None:
+                profile_ids[key_id] = self.criteria_values.ids_equal_to(value)
+
+        matched = []
+        for record in self._candidates(profile_ids):
+            matched.append(record)
+            if limit is not None and len(matched) >= limit:
+                break
+        return matched
+
+    def _candidates(self, profile_ids: Dict[int, Tuple[int, ...]]) -> Iterator[SchemeRecord]:
+        records = iter(self._records)
+        if not profile_ids:
+            yield from records
+            return
+
+        budget = sum(len(self._constrained.get(key_id, ())) for key_id in profile_ids) // INDEX_COST_RATIO
+        checked: Dict[int, bool] = {}
+        for record in records:
+            block = record.block
+            if block is not None:
+                fits = checked.get(block)
+                if fits is None:
+                    if len(checked) >= budget:
+                        break
+                    fits = checked[block] = self._fits(self._blocks[block], profile_ids)
+                if not fits:
+                    continue
+            yield record
+        else:
+            return
+
+        # Long scans evaluate the remaining blocks at once through the index
+        failing = self._failing_blocks(profile_ids)
+        for record in chain((record,), records):
+            if record.block not in failing:
+                yield record
+
+    def _fits(self, packed: array, profile_ids: Dict[int, Tuple[int, ...]]) -> bool:
+        # Walks the packed [key_id, kind, count, value_ids...] groups in place
+        i, end = 0, len(packed)
+        while i < end:
+            user_ids = profile_ids.get(packed[i])
+            count = packed[i + 2]
+            if user_ids is not None:
+                for j in range(i + 3, i + 3 + count):
+                    if packed[j] in user_ids:
+                        break
+                else:
+                    return False
+            i += 3 + count
+        return True
+
+    def _failing_blocks(self, profile_ids: Dict[int, Tuple[int, ...]]) -> Set[int]:
+        # A block fails if it constrains a profile key without accepting its value
+        failing: Set[int] = set()
+        for key_id, value_ids in profile_ids.items():
+            constrained = self._constrained.get(key_id)
+            if constrained is None:
+                continue
+            rejecting = set(constrained)
+            for value_id in value_ids:
+                rejecting.difference_update(self._accepted.get((key_id, value_id), ()))
+            failing |= rejecting
+        return failing
+
+    def has_document(self, record: SchemeRecord, document: str) -> bool:
+        doc_id = self.documents.get(document)
+        return doc_id is not None and doc_id in record.documents
+
+    def to_dict(self, record: SchemeRecord) -> Dict[str, Any]:
+        """Rebuild the plain dict shape used by the API for one record."""
+        scheme: Dict[str, Any] = {
+            "id": record.id,
+            "title": record.title,
+            "description": record.description,
+            "eligibility": record.eligibility,
+        }
+        if record.criteria is not None:
+            criteria = {}
+            for key_id, kind, value_ids in record.iter_criteria():
+                values = [self.criteria_values.value(v) for v in value_ids]
+                criteria[self.criteria_keys.value(key_id)] = values if kind == CRITERION_ANY_OF else values[0]
+            scheme["eligibility_criteria"] = criteria
+        scheme["documents"] = [self.documents.value(d) for d in record.documents]
+        scheme["steps"] = [self.steps.value(s) for s in record.steps]
+        scheme["benefits"] = record.benefits
+        if record.extra:
+            scheme.update(record.extra)
+        return scheme
+
+    def to_dicts(self, records: Optional[Iterable[SchemeRecord]] = None) -> List[Dict[str, Any]]:
+        return [self.to_dict(r) for r in (self._records if records is None else records)]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
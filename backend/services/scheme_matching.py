@@ -2,6 +2,9 @@ import logging
 import asyncio
 from typing import Dict, List, Any, Optional
 
+from .scheme_catalog import SchemeCatalog
+from .tracing import traced
+
 logger = logging.getLogger(__name__)
 
 # Mock database of government schemes
@@ -118,6 +121,11 @@ SCHEMES_DB = [
     }
 ]
 
+# Compact, interned representation used for lookups and matching.
+# Schemes are converted back to the dict shape above only when returned.
+SCHEME_CATALOG = SchemeCatalog.from_dicts(SCHEMES_DB)
+
+@traced("match_schemes", summarize=lambda schemes: [s["id"] for s in schemes])
 async def match_schemes(user_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Match government schemes based on user profile information.
@@ -134,45 +142,20 @@ async def match_schemes(user_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
         # Simulate processing time
         await asyncio.sleep(1)
         
-        matched_schemes = []
-        
-        # In a production environment, this would be a database query
-        for scheme in SCHEMES_DB:
-            is_match = True
-            
-            # Check eligibility criteria
-            if "eligibility_criteria" in scheme:
-                for key, value in scheme["eligibility_criteria"].items():
-                    if key in user_profile:
-                        # Handle list type criteria (e.g., income levels, age ranges)
-                        if isinstance(value, list):
-                            if user_profile[key] not in value:
-                                is_match = False
-                                break
-                        # Handle boolean criteria
-                        elif isinstance(value, bool):
-                            if user_profile[key] != value:
-                                is_match = False
-                                break
-                        # Handle other types
-                        else:
-                            if user_profile[key] != value:
-                                is_match = False
-                                break
-            
-            if is_match:
-                matched_schemes.append(scheme)
+        # Match against the compact catalog, keeping the top 3 schemes
+        matched = SCHEME_CATALOG.match(user_profile, limit=3)
         
         # If no exact matches, return schemes with minimal requirements
-        if not matched_schemes:
-            for scheme in SCHEMES_DB:
-                # Check if scheme has Aadhaar as the only requirement
-                if "has_aadhaar" in user_profile and user_profile["has_aadhaar"] and \
-                   "Aadhaar Card" in scheme.get("documents", []):
-                    matched_schemes.append(scheme)
+        if not matched:
+            # Check if scheme has Aadhaar as the only requirement
+            if "has_aadhaar" in user_profile and user_profile["has_aadhaar"]:
+                for record in SCHEME_CATALOG:
+                    if SCHEME_CATALOG.has_document(record, "Aadhaar Card"):
+                        matched.append(record)
+                        if len(matched) == 3:
+                            break
         
-        # Limit to top 3 schemes
-        matched_schemes = matched_schemes[:3]
+        matched_schemes = SCHEME_CATALOG.to_dicts(matched)
         
         logger.info(f"Matched {len(matched_schemes)} schemes")
         return matched_schemes
@@ -193,10 +176,8 @@ async def get_scheme_by_id(scheme_id: str) -> Optional[Dict[str, Any]]:
         Scheme details or None if not found
     """
     try:
-        for scheme in SCHEMES_DB:
-            if scheme["id"] == scheme_id:
-                return scheme
-        return None
+        record = SCHEME_CATALOG.get(scheme_id)
+        return SCHEME_CATALOG.to_dict(record) if record else None
     except Exception as e:
         logger.error(f"Error getting scheme by ID: {str(e)}")
         return None
\ No newline at end of file
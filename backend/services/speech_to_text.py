@@ -3,12 +3,16 @@ import logging
 import asyncio
 import whisper
 
+from .scheduler import run_inference
+from .tracing import traced, summarize_text
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 # Load Whisper model once (you can choose tiny, base, small, medium, large)
 whisper_model = whisper.load_model("base")
 
+@traced("transcribe_audio", summarize=summarize_text)
 async def transcribe_audio(audio_file_path: str) -> str:
     """
     Transcribe audio file to text using Whisper.
@@ -19,8 +23,8 @@ async def transcribe_audio(audio_file_path: str) -> str:
         if not os.path.exists(audio_file_path):
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
 
-        # Run actual transcription
-        result = whisper_model.transcribe(audio_file_path)
+        # Run actual transcription off the event loop so other requests keep flowing
+        result = await run_inference(whisper_model.transcribe, audio_file_path)
         transcribed_text = result["text"].strip()
 
         logger.info(f"Transcribed text: {transcribed_text}")
@@ -45,7 +49,7 @@ async def detect_language(audio_file_path: str) -> str:
         audio = whisper.pad_or_trim(audio)
         mel = whisper.log_mel_spectrogram(audio).to(whisper_model.device)
 
-        _, probs = whisper_model.detect_language(mel)
+        _, probs = await run_inference(whisper_model.detect_language, mel)
         language_code = max(probs, key=probs.get)
 
         logger.info(f"Detected language: {language_code}")
@@ -5,6 +5,10 @@ import argparse
 from typing import Optional
 import uuid
 
+from .scheduler import run_inference, raise_if_abandoned
+from .tracing import traced
+from .voice_profiles import voice_registry, get_tts_model, DEFAULT_VOICE, DEFAULT_EMOTION
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,15 +39,36 @@ async def generate_empathetic_speech(text: str, emotion: str, output_path: Optio
         Path to the generated audio file
     """
     logger.info(f"Generating empathetic speech with emotion: {emotion}")
-    return await generate_hindi_speech(text, output_path)
+    return await generate_hindi_speech(text, output_path, emotion=emotion)
+
+def _synthesize(text: str, output_path: str, voice: str, emotion: str) -> None:
+    # Runs in a worker thread: model and voice conditioning are loaded once and reused
+    tts = get_tts_model()
+    profile = voice_registry.get(voice, emotion)
+    # Model and latent loading can be slow; don't synthesize for a request that is gone
+    raise_if_abandoned()
+    out = tts.synthesizer.tts_model.inference(
+        text,
+        "hi",  # Language code for Hindi
+        profile.gpt_cond_latent,
+        profile.speaker_embedding,
+        # Split into sentences like tts_to_file does; Hindi is capped at 250 chars per pass
+        enable_text_splitting=True,
+        **profile.inference_kwargs
+    )
+    tts.synthesizer.save_wav(wav=out["wav"], path=output_path)
 
-async def generate_hindi_speech(text: str, output_path: Optional[str] = None) -> str:
+@traced("text_to_speech", summarize=lambda path: {"bytes": os.path.getsize(path)})
+async def generate_hindi_speech(text: str, output_path: Optional[str] = None,
+                                emotion: str = DEFAULT_EMOTION, voice: str = DEFAULT_VOICE) -> str:
     """
     Generate Hindi speech from text using XTTS v2 model
     
     Args:
         text: Hindi text to convert to speech
         output_path: Path to save the generated audio file
+        emotion: Emotion preset selecting the cached voice conditioning
+        voice: Voice profile name (see services/voice_profiles.py)
         
     Returns:
         Path to the generated audio file
@@ -60,23 +85,10 @@ async def generate_hindi_speech(text: str, output_path: Optional[str] = None) ->
             output_path = os.path.abspath(output_path)
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Use XTTS v2 model which supports Hindi
-        model_name = "tts_models/multilingual/multi-dataset/xtts_v2"
-        
         try:
-            from TTS.api import TTS
-            logger.info("Loading Hindi TTS model...")
-            
-            # Initialize TTS with the selected model
-            tts = TTS(model_name=model_name)
-            
-            # Generate the audio file with Hindi settings
-            tts.tts_to_file(
-                text=text,
-                file_path=output_path,
-                speaker="female",  # You can try different speaker voices
-                language="hi"       # Language code for Hindi
-            )
+            # Generate the audio file with Hindi settings (in a worker thread,
+            # so the event loop can still notice disconnects and deadlines)
+            await run_inference(_synthesize, text, output_path, voice, emotion)
             
             logger.info(f"Hindi audio generated at: {output_path}")
             return output_path
@@ -96,11 +108,13 @@ async def main():
     parser = argparse.ArgumentParser(description="Hindi Text-to-Speech")
     parser.add_argument("text", help="Hindi text to convert to speech")
     parser.add_argument("--output", help="Output file path (optional)", default=None)
+    parser.add_argument("--emotion", help="Emotion preset (neutral, happy, sad, angry)", default=DEFAULT_EMOTION)
+    parser.add_argument("--voice", help="Voice profile name", default=DEFAULT_VOICE)
     
     args = parser.parse_args()
     
     try:
-        output_path = await generate_hindi_speech(args.text, args.output)
+        output_path = await generate_hindi_speech(args.text, args.output, emotion=args.emotion, voice=args.voice)
         logger.info(f"Success! Hindi audio saved to: {output_path}")
     except Exception as e:
         logger.error(f"Failed to generate Hindi speech: {str(e)}")
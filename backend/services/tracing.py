@@ -0,0 +1,249 @@
+import os
+import json
+import asyncio
+import time
+import uuid
+import hashlib
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: nothing is recorded unless MAITRI_TRACE=1
+TRACE_ENABLED = os.getenv("MAITRI_TRACE", "0") == "1"
+TRACE_PATH = os.getenv("MAITRI_TRACE_PATH", os.path.join("traces", "voice.jsonl"))
+
+# "hash" keeps only content hashes and sizes. "envelope" additionally keeps the
+# duration and a coarse loudness envelope of uploaded audio. Recordings and
+# text are never stored verbatim: a raw voice recording identifies the speaker
+# no matter what metadata is stripped from it.
+TRACE_CAPTURE = os.getenv("MAITRI_TRACE_CAPTURE", "hash")
+
+# Salt for anonymized client keys and text hashes; random per process unless
+# pinned, so keys cannot be joined back to IP addresses and short, common
+# phrases cannot be recovered from their hash with a dictionary
+CLIENT_KEY_SALT = os.getenv("MAITRI_TRACE_SALT") or uuid.uuid4().hex
+
+# Loudness envelope resolution (frames per second) in "envelope" mode
+ENVELOPE_RATE = 10
+
+# Request headers that change how a request is scheduled and are replayed as-is
+REPLAYED_HEADERS = ("X-Priority", "X-Request-Timeout")
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("maitri_trace", default=None)
+
+
+class Trace:
+    """
+    Timings and outputs of one request as it moves through the voice pipeline.
+
+    Args:
+        route: Route path, e.g. /audio/speech-to-text
+        method: HTTP method
+    """
+
+    def __init__(self, route: str, method: str = "POST"):
+        self.trace_id = uuid.uuid4().hex
+        self.route = route
+        self.method = method
+        self.ts = time.time()
+        self.started = time.perf_counter()
+        self.input: Dict[str, Any] = {}
+        self.stages: List[Dict[str, Any]] = []
+        self.status = 200
+        self.total_ms: Optional[float] = None
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "ts": round(self.ts, 3),
+            "route": self.route,
+            "method": self.method,
+            "input": self.input,
+            "stages": self.stages,
+            "status": self.status,
+            "total_ms": self.total_ms if self.total_ms is not None else self.elapsed_ms(),
+        }
+
+
+class TraceWriter:
+    """
+    Append-only JSON lines log of traces.
+
+    Args:
+        path: Log file path
+    """
+
+    def __init__(self, path: str = TRACE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, trace: Trace) -> None:
+        line = json.dumps(trace.to_record(), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+writer = TraceWriter()
+
+
+def read_traces(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read traces from a log, skipping torn or corrupt lines.
+
+    Args:
+        path: Trace log path
+
+    Returns:
+        Iterator over trace records
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning("Skipping unreadable trace line")
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def summarize_text(text: Any) -> Dict[str, Any]:
+    """Describe text by salted hash and length only."""
+    if not isinstance(text, str):
+        return {"type": type(text).__name__}
+    return {"sha256": _digest(f"{CLIENT_KEY_SALT}:{text}".encode("utf-8"))[:16], "chars": len(text)}
+
+
+def describe_audio(audio_path: str) -> Dict[str, Any]:
+    """
+    Anonymized description of a recording: duration and a coarse loudness
+    envelope (RMS per 1/ENVELOPE_RATE s, quantized to 0-255). No spectral
+    content is kept, so neither the words nor the voice can be recovered.
+
+    Args:
+        audio_path: Path to the uploaded audio file
+
+    Returns:
+        Dict with duration_s, envelope_rate and envelope
+    """
+    import numpy as np
+    import whisper
+
+    samples = whisper.load_audio(audio_path)  # 16 kHz mono float32
+    frame = whisper.audio.SAMPLE_RATE // ENVELOPE_RATE
+    usable = len(samples) - len(samples) % frame
+    rms = np.sqrt(np.mean(samples[:usable].reshape(-1, frame) ** 2, axis=1)) if usable else np.zeros(0)
+    return {
+        "duration_s": round(len(samples) / whisper.audio.SAMPLE_RATE, 2),
+        "envelope_rate": ENVELOPE_RATE,
+        "envelope": np.clip(np.round(rms * 255), 0, 255).astype(int).tolist(),
+    }
+
+
+@asynccontextmanager
+async def capture_trace(request: Request, route: str, audio: Optional[bytes] = None,
+                        audio_path: Optional[str] = None, text: Optional[str] = None) -> AsyncIterator[Optional[Trace]]:
+    """
+    Record a trace for a route handler if tracing is enabled.
+
+    Args:
+        request: Incoming request
+        route: Route path recorded in the trace
+        audio: Uploaded audio bytes, if any
+        audio_path: Where the upload was saved, used for the envelope in "envelope" mode
+        text: Text input, if any
+
+    Yields:
+        The active Trace, or None when tracing is disabled
+    """
+    if not TRACE_ENABLED:
+        yield None
+        return
+
+    trace = Trace(route, request.method)
+    # Lets replays reproduce per-client admission without recording addresses
+    host = request.client.host if request.client else "unknown"
+    trace.input["client"] = _digest(f"{CLIENT_KEY_SALT}:{host}".encode("utf-8"))[:12]
+    headers = {h: request.headers[h] for h in REPLAYED_HEADERS if h in request.headers}
+    if headers:
+        trace.input["headers"] = headers
+    if audio is not None:
+        digest = _digest(audio)
+        trace.input["audio"] = {"sha256": digest, "bytes": len(audio)}
+    if text is not None:
+        trace.input["text"] = summarize_text(text)
+
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except HTTPException as e:
+        trace.status = e.status_code
+        raise
+    except Exception:
+        trace.status = 500
+        raise
+    finally:
+        _current_trace.reset(token)
+        trace.total_ms = trace.elapsed_ms()
+        try:
+            # Rate-limited requests did no work, so they get no decode either
+            if TRACE_CAPTURE == "envelope" and audio_path is not None and trace.status != 429:
+                trace.input.setdefault("audio", {}).update(await asyncio.to_thread(describe_audio, audio_path))
+            writer.write(trace)
+        except Exception as e:
+            logger.error(f"Error writing trace: {str(e)}")
+
+
+def traced(stage: str, summarize: Optional[Callable[[Any], Any]] = None):
+    """
+    Decorator recording the timing (and a summary of the output) of an async
+    pipeline stage into the active trace. A no-op when no trace is active.
+
+    Only stages reached from a route inside capture_trace are recorded. Today
+    that is queue_wait, transcribe_audio and text_to_speech; classify_intent
+    and match_schemes are instrumented but no traced route calls them yet
+    (APIClient.process_audio is not served by any route).
+
+    Args:
+        stage: Stage name, e.g. transcribe_audio
+        summarize: Turns the stage's return value into something loggable
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return await func(*args, **kwargs)
+
+            entry: Dict[str, Any] = {"name": stage, "start_ms": trace.elapsed_ms()}
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+                if summarize is not None:
+                    entry["output"] = summarize(result)
+                return result
+            except BaseException as e:
+                entry["error"] = type(e).__name__
+                raise
+            finally:
+                entry["ms"] = round((time.perf_counter() - started) * 1000, 2)
+                trace.stages.append(entry)
+        return wrapper
+    return decorator
@@ -0,0 +1,192 @@
+"""
+Voice profiles for XTTS synthesis.
+
+Conditioning latents are computed once per set of reference clips found in
+voices/<voice>/<emotion>/*.wav and cached on disk. No reference clips ship
+with the repository: until clips are added, every emotion uses the same
+built-in XTTS speaker and emotions only differ in sampling settings
+(temperature and speed), not in the voice itself.
+"""
+import os
+import glob
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# XTTS v2 supports Hindi and voice cloning from short reference clips
+MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+
+# Reference clips live in voices/<voice>/<emotion>/*.wav
+VOICES_DIR = os.getenv("MAITRI_VOICES_DIR", os.path.join(os.getcwd(), "voices"))
+CACHE_DIR = os.path.join(VOICES_DIR, ".cache")
+
+DEFAULT_VOICE = os.getenv("MAITRI_DEFAULT_VOICE", "didi")
+DEFAULT_EMOTION = "neutral"
+
+# Built-in XTTS speaker used when no reference clips are available
+FALLBACK_SPEAKER = os.getenv("MAITRI_FALLBACK_SPEAKER", "Ana Florence")
+
+# Sampling settings applied on top of each emotion's conditioning latents
+EMOTION_PRESETS: Dict[str, Dict[str, float]] = {
+    "neutral": {"temperature": 0.65, "speed": 1.0},
+    "happy": {"temperature": 0.75, "speed": 1.08},
+    "sad": {"temperature": 0.6, "speed": 0.9},
+    "angry": {"temperature": 0.7, "speed": 1.05},
+}
+
+_tts = None
+_tts_lock = threading.Lock()
+
+
+def get_tts_model():
+    """
+    Load the XTTS v2 model once and share it across requests.
+
+    Returns:
+        TTS API object wrapping the loaded XTTS model
+    """
+    global _tts
+    with _tts_lock:
+        if _tts is None:
+            from TTS.api import TTS
+            logger.info("Loading Hindi TTS model...")
+            _tts = TTS(model_name=MODEL_NAME)
+        return _tts
+
+
+class VoiceProfile:
+    """
+    Cached XTTS conditioning for one voice and emotion preset.
+
+    Args:
+        voice: Voice name (directory under VOICES_DIR)
+        emotion: Emotion preset name
+        gpt_cond_latent: GPT conditioning latent tensor
+        speaker_embedding: Speaker embedding tensor
+        inference_kwargs: Sampling settings for this emotion
+    """
+
+    __slots__ = ("voice", "emotion", "gpt_cond_latent", "speaker_embedding", "inference_kwargs")
+
+    def __init__(self, voice: str, emotion: str, gpt_cond_latent: Any, speaker_embedding: Any,
+                 inference_kwargs: Dict[str, float]):
+        self.voice = voice
+        self.emotion = emotion
+        self.gpt_cond_latent = gpt_cond_latent
+        self.speaker_embedding = speaker_embedding
+        self.inference_kwargs = inference_kwargs
+
+
+class VoiceProfileRegistry:
+    """
+    Computes XTTS conditioning latents once per reference clip set, persists them
+    to disk and serves them from memory on every synthesis call.
+    """
+
+    def __init__(self, voices_dir: str = VOICES_DIR, cache_dir: str = CACHE_DIR):
+        self.voices_dir = voices_dir
+        self.cache_dir = cache_dir
+        self._profiles: Dict[Tuple[str, str], VoiceProfile] = {}
+        self._latents: Dict[str, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, voice: str = DEFAULT_VOICE, emotion: str = DEFAULT_EMOTION) -> VoiceProfile:
+        """
+        Get the profile for a voice and emotion, computing it on first use.
+
+        Unknown emotions fall back to neutral. Emotions without reference clips
+        reuse the voice's neutral clips with the emotion's sampling settings.
+
+        Args:
+            voice: Voice name
+            emotion: Emotion preset (neutral, happy, sad, angry)
+
+        Returns:
+            VoiceProfile with conditioning latents ready for inference
+        """
+        if emotion not in EMOTION_PRESETS:
+            logger.warning(f"Unknown emotion '{emotion}', using {DEFAULT_EMOTION}")
+            emotion = DEFAULT_EMOTION
+
+        key = (voice, emotion)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._load(voice, emotion)
+                self._profiles[key] = profile
+            return profile
+
+    def warm_up(self, voice: str = DEFAULT_VOICE) -> None:
+        """Precompute profiles for every emotion preset of a voice."""
+        for emotion in EMOTION_PRESETS:
+            self.get(voice, emotion)
+
+    def _reference_clips(self, voice: str, emotion: str) -> List[str]:
+        clips = sorted(glob.glob(os.path.join(self.voices_dir, voice, emotion, "*.wav")))
+        if not clips and emotion != DEFAULT_EMOTION:
+            clips = sorted(glob.glob(os.path.join(self.voices_dir, voice, DEFAULT_EMOTION, "*.wav")))
+        return clips
+
+    def _fingerprint(self, clips: List[str]) -> str:
+        # Identifies the clip set, so emotions that reuse the neutral clips share
+        # one encoder pass and one cache file; changes to any clip invalidate it
+        parts = [f"{os.path.relpath(c, self.voices_dir)}:{os.path.getsize(c)}:{int(os.path.getmtime(c))}"
+                 for c in clips]
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def _load(self, voice: str, emotion: str) -> VoiceProfile:
+        inference_kwargs = EMOTION_PRESETS[emotion]
+        clips = self._reference_clips(voice, emotion)
+
+        if not clips:
+            logger.warning(f"No reference clips for voice '{voice}', using built-in speaker {FALLBACK_SPEAKER}")
+            model = get_tts_model().synthesizer.tts_model
+            speaker = model.speaker_manager.speakers[FALLBACK_SPEAKER]
+            return VoiceProfile(voice, emotion, speaker["gpt_cond_latent"], speaker["speaker_embedding"],
+                                inference_kwargs)
+
+        gpt_cond_latent, speaker_embedding = self._conditioning(voice, clips)
+        return VoiceProfile(voice, emotion, gpt_cond_latent, speaker_embedding, inference_kwargs)
+
+    def _conditioning(self, voice: str, clips: List[str]) -> Tuple[Any, Any]:
+        import torch
+
+        fingerprint = self._fingerprint(clips)
+        latents = self._latents.get(fingerprint)
+        if latents is not None:
+            return latents
+
+        model = get_tts_model().synthesizer.tts_model
+        cache_path = os.path.join(self.cache_dir, f"{voice}_{fingerprint}.pt")
+
+        if os.path.exists(cache_path):
+            try:
+                cached = torch.load(cache_path, map_location=model.device)
+                logger.info(f"Loaded cached conditioning for {voice} ({fingerprint})")
+                latents = (cached["gpt_cond_latent"], cached["speaker_embedding"])
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable voice cache {cache_path}: {str(e)}")
+
+        if latents is None:
+            logger.info(f"Computing conditioning latents for {voice} from {len(clips)} clip(s)")
+            gpt_cond_latent, speaker_embedding = model.get_conditioning_latents(audio_path=clips)
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            torch.save(
+                {
+                    "gpt_cond_latent": gpt_cond_latent.cpu(),
+                    "speaker_embedding": speaker_embedding.cpu(),
+                },
+                cache_path,
+            )
+            latents = (gpt_cond_latent, speaker_embedding)
+
+        self._latents[fingerprint] = latents
+        return latents
+
+
+# Shared registry for all synthesis calls
+voice_registry = VoiceProfileRegistry()